@@ -1,6 +1,7 @@
 """Script to retrieve and display account numbers."""
 
-import json
+import sys
+import orjson
 import schwab_client
 
 
@@ -9,7 +10,8 @@ def print_info():
 
     client = schwab_client.SchwabClient()
     data = client.get_account_numbers()
-    print(json.dumps(data, indent=4, sort_keys=False))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
 
 
 if __name__=="__main__":
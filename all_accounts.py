@@ -4,6 +4,13 @@ import argparse
 import schwab_client
 
 
+# Table borders and header
+_TOP_54 = "┌" + "─"*54 + "┐"
+_MID_54 = "├" + "─"*54 + "┤"
+_BOT_54 = "└" + "─"*54 + "┘"
+_HEADER_54 = "│ Account                   Value           Percent    │"
+
+
 def print_all_accounts(profile: str = "default", verbose: bool = False):
     """Prints a summary of all accounts for the given profile.
 
@@ -14,31 +21,18 @@ def print_all_accounts(profile: str = "default", verbose: bool = False):
 
     client = schwab_client.SchwabClient(profile=profile, verbose=verbose)
 
-    # Get all account numbers
-    accounts = client.get_account_numbers()
-
-    # Collect account data and calculate total
-    account_data = []
-    total_sum = 0.0
-
-    for account_info in accounts:
-        account_hash = account_info['hashValue']
-        account_number = account_info['accountNumber']
-
-        # Get account values
-        values = client.get_account_values(account_hash)
-        total = values['total']
-        total_sum += total
+    # Get balances for all accounts in a single request
+    account_data = [
+        {'number': account['account_number'], 'value': account['total']}
+        for account in client.get_all_accounts(include_positions=False)
+    ]
 
-        account_data.append({
-            'number': account_number,
-            'value': total
-        })
+    total_sum = sum(account['value'] for account in account_data)
 
     # Print header
-    print("┌" + "─"*54 + "┐")
-    print("│ Account                   Value           Percent    │")
-    print("├" + "─"*54 + "┤")
+    print(_TOP_54)
+    print(_HEADER_54)
+    print(_MID_54)
 
     # Print each account with percentage
     for account in account_data:
@@ -46,9 +40,9 @@ def print_all_accounts(profile: str = "default", verbose: bool = False):
         print(f"│ {account['number']:<24}  ${account['value']:>12,.2f}  ({pct:>5.1f}%)    │")
 
     # Print total
-    print("├" + "─"*54 + "┤")
+    print(_MID_54)
     print(f"│ {'TOTAL':<24}  ${total_sum:>12,.2f}  (100.0%)    │")
-    print("└" + "─"*54 + "┘")
+    print(_BOT_54)
 
 
 if __name__ == "__main__":
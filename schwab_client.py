@@ -4,8 +4,11 @@ This module provides a clean interface for interacting with the Schwab API.
 Authentication is handled automatically via token_manager.
 """
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
+from urllib3.util.retry import Retry
 
 import token_manager
 
@@ -18,6 +21,9 @@ class SchwabClient:
 
     BASE_URL = "https://api.schwabapi.com/trader/v1"
 
+    # Prebuilt auth headers per profile: profile -> (access_token, headers)
+    _headers_cache: dict[str, tuple[str, dict]] = {}
+
     def __init__(self, profile: str = "default", verbose: bool = False):
         """Initialize the Schwab API client.
 
@@ -28,14 +34,42 @@ class SchwabClient:
         self.profile = profile
         self.verbose = verbose
 
+        # Reuse keep-alive connections to the API host across requests
+        self._session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 502, 503, 504],
+            # Return the last response so raise_for_status() raises HTTPError
+            raise_on_status=False
+        )
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        )
+        # Responses are UTF-8 JSON; ask for compressed bodies and decode the
+        # raw bytes with orjson (never resp.text, which triggers charset detection)
+        self._session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip"
+        })
+
     def _get_headers(self) -> dict:
         """Get headers with valid authentication token.
 
         Returns:
             dict: Headers including Authorization bearer token
         """
+        # token_manager only re-reads the tokens file when it changes or the
+        # token expires; rebuild the header dict only when the token changes
         access_token = token_manager.get_valid_token(profile=self.profile, verbose=self.verbose)
-        return {"Authorization": f"Bearer {access_token}"}
+        cached = self._headers_cache.get(self.profile)
+        if cached is not None and cached[0] == access_token:
+            return cached[1]
+
+        headers = {"Authorization": f"Bearer {access_token}"}
+        self._headers_cache[self.profile] = (access_token, headers)
+        return headers
 
     def get_account_numbers(self) -> list:
         """Get all account numbers for the authenticated user.
@@ -46,14 +80,14 @@ class SchwabClient:
         Raises:
             requests.HTTPError: If the API request fails
         """
-        resp = requests.get(
+        resp = self._session.get(
             f"{self.BASE_URL}/accounts/accountNumbers",
             headers=self._get_headers()
         )
         if self.verbose:
             print(f'[SchwabClient] get_account_numbers status: {resp.status_code}')
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     def get_account_data(
         self,
@@ -76,7 +110,7 @@ class SchwabClient:
         if include_positions:
             params["fields"] = "positions"
 
-        resp = requests.get(
+        resp = self._session.get(
             f"{self.BASE_URL}/accounts/{account_number}",
             headers=self._get_headers(),
             params=params
@@ -84,9 +118,13 @@ class SchwabClient:
         if self.verbose:
             print(f'[SchwabClient] get_account_data status: {resp.status_code}')
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
-    def get_account_values(self, account_number: str) -> dict:
+    def get_account_values(
+        self,
+        account_number: str,
+        include_positions: bool = True
+    ) -> dict:
         """Get simplified account values including total, cash, and positions.
 
         This is a convenience method that extracts the most commonly needed
@@ -94,6 +132,8 @@ class SchwabClient:
 
         Args:
             account_number: The account number to retrieve values for
+            include_positions: Whether to fetch position details (default: True).
+                When False, only balances are requested and positions is empty.
 
         Returns:
             dict: Dictionary with keys:
@@ -104,8 +144,48 @@ class SchwabClient:
         Raises:
             requests.HTTPError: If the API request fails
         """
-        data = self.get_account_data(account_number, include_positions=True)
+        data = self.get_account_data(account_number, include_positions=include_positions)
+        return self._parse_account_values(data)
 
+    def get_all_accounts(self, include_positions: bool = False) -> list:
+        """Get simplified values for every account in a single request.
+
+        Args:
+            include_positions: Whether to fetch position details (default: False)
+
+        Returns:
+            list: One dictionary per account with keys:
+                - account_number (str): Plain account number
+                - total (float): Total liquidation value
+                - cash (float): Total cash balance
+                - positions (dict): Symbol -> market value mapping
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        params = {}
+        if include_positions:
+            params["fields"] = "positions"
+
+        resp = self._session.get(
+            f"{self.BASE_URL}/accounts",
+            headers=self._get_headers(),
+            params=params
+        )
+        if self.verbose:
+            print(f'[SchwabClient] get_all_accounts status: {resp.status_code}')
+        resp.raise_for_status()
+
+        accounts = []
+        for data in orjson.loads(resp.content):
+            values = self._parse_account_values(data)
+            values['account_number'] = data["securitiesAccount"]["accountNumber"]
+            accounts.append(values)
+        return accounts
+
+    @staticmethod
+    def _parse_account_values(data: dict) -> dict:
+        """Extract total, cash, and positions from raw account data."""
         values = {}
 
         # Get total account value
@@ -118,13 +198,30 @@ class SchwabClient:
 
         # Extract position values
         positions = securities.get('positions', [])
-        positions_dict = {}
-        for pos in positions:
-            positions_dict[pos['instrument']['symbol']] = pos['marketValue']
-        values['positions'] = positions_dict
+        values['positions'] = {
+            pos['instrument']['symbol']: pos['marketValue'] for pos in positions
+        }
 
         return values
 
+    def get_totals_only(self, account_number: str) -> float:
+        """Get only the total liquidation value of an account.
+
+        Requests balances without positions and skips parsing everything
+        except the aggregated balance.
+
+        Args:
+            account_number: The account number to retrieve the total for
+
+        Returns:
+            float: Total liquidation value
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        data = self.get_account_data(account_number, include_positions=False)
+        return data["aggregatedBalance"]["liquidationValue"]
+
 
 # Convenience function for backward compatibility
 def get_client() -> SchwabClient:
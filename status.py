@@ -1,7 +1,8 @@
 """This script shows the basic status of an account."""
 
 import os
-import json
+import sys
+import orjson
 import argparse
 from pathlib import Path
 
@@ -21,9 +22,19 @@ ROTH = os.environ.get("ACCT_NUM_ROTH")
 ROTH2 = os.environ.get("ACCT_NUM_ROTH2")
 IRA = os.environ.get("ACCT_NUM_IRA")
 
+# Table borders and headers
+_TOP_51 = "┌" + "─"*51 + "┐"
+_MID_51 = "├" + "─"*51 + "┤"
+_BOT_51 = "└" + "─"*51 + "┘"
+_HEADER_51 = "│ Asset      Value     %   Tgt%    Target     Delta │"
+_TOP_26 = "┌" + "─"*26 + "┐"
+_MID_26 = "├" + "─"*26 + "┤"
+_BOT_26 = "└" + "─"*26 + "┘"
+_HEADER_26 = "│ Asset      Value     %   │"
 
-def print_line(name: str, value: float, total: float, target_percent: float = None):
-    """Helper function to print lines in the status table."""
+
+def format_line(name: str, value: float, total: float, target_percent: float = None) -> str:
+    """Helper function to format lines in the status table."""
 
     percent = value/total*100
 
@@ -31,7 +42,7 @@ def print_line(name: str, value: float, total: float, target_percent: float = No
         target_value = target_percent*total
         target_percent_display = target_percent * 100
         delta = target_value - value
-        print(
+        return (
             f'│ {name:<6}'
             f'{value:>10.2f}'
             f'{percent:>7.2f}%'
@@ -40,7 +51,7 @@ def print_line(name: str, value: float, total: float, target_percent: float = No
             f'{delta:>10.2f} │'
         )
     else:
-        print(
+        return (
             f'│ {name:<6}'
             f'{value:>10.2f}'
             f'{percent:>7.2f}% │'
@@ -50,40 +61,45 @@ def print_line(name: str, value: float, total: float, target_percent: float = No
 def print_status(values: dict, targets: dict = None):
     """Formats and prints the status table given the output of get_account_values."""
 
+    lines: list[str] = []
+
     # print table header
     if targets is not None:
-        print("┌" + "─"*51 + "┐")
-        print("│ Asset      Value     %   Tgt%    Target     Delta │")
-        print("├" + "─"*51 + "┤")
+        lines.append(_TOP_51)
+        lines.append(_HEADER_51)
+        lines.append(_MID_51)
     else:
-        print("┌" + "─"*26 + "┐")
-        print("│ Asset      Value     %   │")
-        print("├" + "─"*26 + "┤")
+        lines.append(_TOP_26)
+        lines.append(_HEADER_26)
+        lines.append(_MID_26)
 
     total = values['total']  # Total account value
 
     cash = values['cash']  # Cash value
-    print_line('Cash', cash, total, 0.0 if targets is not None else None)
+    lines.append(format_line('Cash', cash, total, 0.0 if targets is not None else None))
 
     # print information on the positions in the account
     for symbol, val in values['positions'].items():
         target_pct = targets.get(symbol) if targets is not None else None
-        print_line(symbol, val, total, target_pct)
+        lines.append(format_line(symbol, val, total, target_pct))
 
     # print positions that have targets but are not in the portfolio
     if targets is not None:
         for symbol, target_pct in targets.items():
             if symbol not in values['positions']:
-                print_line(symbol, 0.0, total, target_pct)
+                lines.append(format_line(symbol, 0.0, total, target_pct))
 
     if targets is not None:
-        print("├" + "─"*51 + "┤")
-        print_line('TOTAL', total, total, 1.0)
-        print("└" + "─"*51 + "┘")
+        lines.append(_MID_51)
+        lines.append(format_line('TOTAL', total, total, 1.0))
+        lines.append(_BOT_51)
     else:
-        print("├" + "─"*26 + "┤")
-        print_line('TOTAL', total, total)
-        print("└" + "─"*26 + "┘")
+        lines.append(_MID_26)
+        lines.append(format_line('TOTAL', total, total))
+        lines.append(_BOT_26)
+
+    # write the whole table at once
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_all(account_number: str, profile: str = "default"):
@@ -96,7 +112,8 @@ def print_all(account_number: str, profile: str = "default"):
 
     client = schwab_client.SchwabClient(profile=profile)
     data = client.get_account_data(account_number, include_positions=True)
-    print(json.dumps(data, indent=4, sort_keys=False))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
 
 
 if __name__=="__main__":
@@ -9,18 +9,16 @@ This module handles OAuth token lifecycle including:
 # Standard library
 import base64
 import hashlib
-import json
 import os
 import secrets
 import threading
 import time
 import urllib.parse
-import webbrowser
 from pathlib import Path
 
 # Third-party
 from dotenv import load_dotenv
-from flask import Flask, request
+import orjson
 import requests
 
 
@@ -58,6 +56,21 @@ def _get_tokens_file(profile: str = "default") -> Path:
 # Use Basic Auth for token requests (recommended)
 USE_BASIC_AUTH = True
 
+# Serializes token refresh so concurrent callers don't double-refresh or
+# race on writes to the tokens file
+_TOKEN_LOCK = threading.Lock()
+
+# Last token read per profile: profile -> (access_token, expires_at, mtime_ns).
+# Guarded by _TOKEN_LOCK; the tokens file mtime detects writes by other processes.
+_TOKEN_CACHE: dict[str, tuple[str, float, int]] = {}
+
+# Shared session so token refreshes reuse a connection to the token endpoint
+_TOKEN_SESSION = requests.Session()
+
+# Basic-auth headers for the token endpoint, built once on first use
+_REFRESH_HEADERS = None
+_HEADERS_LOCK = threading.Lock()
+
 
 # ====== Helper Functions ======
 def _b64url(b: bytes) -> str:
@@ -74,6 +87,19 @@ def _validate_credentials():
         )
 
 
+def _get_refresh_headers() -> dict:
+    """Get the Basic-auth headers for token endpoint requests, building them once."""
+    global _REFRESH_HEADERS
+    with _HEADERS_LOCK:
+        if _REFRESH_HEADERS is None:
+            basic = base64.b64encode(f"{APP_KEY}:{APP_SECRET}".encode()).decode()
+            _REFRESH_HEADERS = {
+                "Authorization": f"Basic {basic}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
+        return _REFRESH_HEADERS
+
+
 # ====== Token Management ======
 def get_valid_token(profile: str = "default", verbose: bool = False) -> str:
     """Get a valid access token, automatically refreshing if expired.
@@ -92,9 +118,24 @@ def get_valid_token(profile: str = "default", verbose: bool = False) -> str:
     """
     _validate_credentials()
 
+    with _TOKEN_LOCK:
+        return _get_valid_token_locked(profile, verbose)
+
+
+def _get_valid_token_locked(profile: str, verbose: bool) -> str:
+    """Read, and refresh if needed, the access token. Caller must hold _TOKEN_LOCK."""
     tokens_file = _get_tokens_file(profile)
-    with open(tokens_file) as f:
-        tokens = json.load(f)
+
+    # Skip reading the file if it hasn't changed and the cached token is fresh
+    mtime_ns = os.stat(tokens_file).st_mtime_ns
+    cached = _TOKEN_CACHE.get(profile)
+    if cached is not None and cached[2] == mtime_ns and cached[1] - 60 > time.time():
+        if verbose:
+            print(f'[token] Access token still valid ({int(cached[1] - time.time())}s remaining)')
+        return cached[0]
+
+    with open(tokens_file, "rb") as f:
+        tokens = orjson.loads(f.read())
 
     # Check if token is expired
     saved_at = tokens.get("_saved_at", 0)
@@ -105,6 +146,7 @@ def get_valid_token(profile: str = "default", verbose: bool = False) -> str:
     if age < (expires_in - 60):
         if verbose:
             print(f'[token] Access token still valid ({expires_in - age}s remaining)')
+        _TOKEN_CACHE[profile] = (tokens["access_token"], saved_at + expires_in, mtime_ns)
         return tokens["access_token"]
 
     # Token expired, refresh it
@@ -117,49 +159,38 @@ def get_valid_token(profile: str = "default", verbose: bool = False) -> str:
         "refresh_token": tokens["refresh_token"]
     }
 
-    # Use Basic Auth
-    basic = base64.b64encode(f"{APP_KEY}:{APP_SECRET}".encode()).decode()
-    headers = {
-        "Authorization": f"Basic {basic}",
-        "Content-Type": "application/x-www-form-urlencoded"
-    }
-
-    resp = requests.post(TOKEN_URL, data=data, headers=headers, timeout=20)
+    resp = _TOKEN_SESSION.post(
+        TOKEN_URL, data=data, headers=_get_refresh_headers(), timeout=20)
 
     if not resp.ok:
         raise Exception(f"Token refresh failed: {resp.status_code} - {resp.text}")
 
     # Save new tokens
-    new_tokens = resp.json()
+    new_tokens = orjson.loads(resp.content)
     new_tokens["_saved_at"] = int(time.time())
-    with open(tokens_file, "w") as f:
-        json.dump(new_tokens, f, indent=2)
+    with open(tokens_file, "wb") as f:
+        f.write(orjson.dumps(new_tokens, option=orjson.OPT_INDENT_2))
     os.chmod(tokens_file, 0o600)
 
     if verbose:
         print("[token] Access token refreshed successfully")
+    expires_at = new_tokens["_saved_at"] + new_tokens.get("expires_in", 1800)
+    _TOKEN_CACHE[profile] = (
+        new_tokens["access_token"], expires_at, os.stat(tokens_file).st_mtime_ns)
     return new_tokens["access_token"]
 
 
 # ====== OAuth Flow ======
-def perform_oauth_flow(profile: str = "default"):
-    """Perform the initial OAuth authorization flow with PKCE.
-
-    This starts a local HTTPS server, opens a browser for user authorization,
-    and exchanges the authorization code for access and refresh tokens.
-
-    The tokens are saved to the secure directory for future use.
+def _build_authorize_url() -> tuple[str, bytes, str]:
+    """Generate fresh PKCE and state values and build the authorize URL.
 
-    Args:
-        profile: Profile name for multi-account support (default: "default")
+    Returns:
+        tuple[str, bytes, str]: Authorize URL, PKCE code verifier, and state
     """
-    _validate_credentials()
-
-    tokens_file = _get_tokens_file(profile)
-
     # Generate PKCE challenge
-    code_verifier = secrets.token_urlsafe(64)  # 43-128 chars
-    code_challenge = _b64url(hashlib.sha256(code_verifier.encode()).digest())
+    # Verifier kept as ASCII bytes (86 chars, within 43-128) so it can be hashed directly
+    code_verifier = base64.urlsafe_b64encode(secrets.token_bytes(64)).rstrip(b"=")
+    code_challenge = _b64url(hashlib.sha256(code_verifier).digest())
     state = secrets.token_urlsafe(16)
 
     # Build authorize URL
@@ -175,6 +206,43 @@ def perform_oauth_flow(profile: str = "default"):
     authorize_url = f"{AUTH_URL}?" + urllib.parse.urlencode(
         params, quote_via=urllib.parse.quote)
 
+    return authorize_url, code_verifier, state
+
+
+def perform_oauth_flow(profile: str = "default"):
+    """Perform the initial OAuth authorization flow with PKCE.
+
+    This starts a local HTTPS server, opens a browser for user authorization,
+    and exchanges the authorization code for access and refresh tokens.
+
+    The tokens are saved to the secure directory for future use.
+
+    Args:
+        profile: Profile name for multi-account support (default: "default")
+
+    Raises:
+        ValueError: If credentials are missing
+        Exception: If the callback times out or the token exchange fails
+    """
+    # Only needed for the one-time authorization, so keep them off the
+    # import path used by get_valid_token
+    import ssl
+    import webbrowser
+
+    from flask import Flask, request
+    from werkzeug.serving import make_server
+
+    _validate_credentials()
+
+    tokens_file = _get_tokens_file(profile)
+
+    # Set by the callback once the code exchange has finished, and whether
+    # tokens were saved
+    done = threading.Event()
+    saved = threading.Event()
+
+    authorize_url, code_verifier, state = _build_authorize_url()
+
     # Create Flask app for callback
     app = Flask(__name__)
 
@@ -188,55 +256,66 @@ def perform_oauth_flow(profile: str = "default"):
         if ret_state != state:
             return "State mismatch", 400
 
-        print("\n[callback] Got code:", code, flush=True)
-
-        # Exchange authorization code for tokens
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        data = {
-            "grant_type": "authorization_code",
-            "code": code,
-            "redirect_uri": REDIRECT_URI,
-            "code_verifier": code_verifier,
-        }
-
-        if USE_BASIC_AUTH:
-            basic = base64.b64encode(f"{APP_KEY}:{APP_SECRET}".encode()).decode()
-            headers["Authorization"] = f"Basic {basic}"
-        else:
-            data["client_id"] = APP_KEY
-            if APP_SECRET:
-                data["client_secret"] = APP_SECRET
-
-        resp = requests.post(TOKEN_URL, data=data, headers=headers, timeout=20)
-        print("[token] status:", resp.status_code, flush=True)
-        print("[token] body:", resp.text, flush=True)
-
-        if resp.ok:
-            try:
-                payload = resp.json()
-                payload["_saved_at"] = int(time.time())
-                with open(tokens_file, "w") as f:
-                    json.dump(payload, f, indent=2)
-                os.chmod(tokens_file, 0o600)
-                print(f"[token] Saved tokens to {tokens_file}", flush=True)
-            except Exception as e:
-                print("[token] couldn't parse/save JSON:", e, flush=True)
-            return "Tokens received  you can close this tab. Check your console.", 200
-        else:
-            return f"Token exchange failed ({resp.status_code}). See console.", 400
-
-    def run_server():
-        app.run(host="127.0.0.1", port=8443, ssl_context=(CERT_FILE, KEY_FILE))
+        try:
+            print("\n[callback] Got code:", code, flush=True)
+
+            # Exchange authorization code for tokens
+            data = {
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": REDIRECT_URI,
+                "code_verifier": code_verifier.decode("ascii"),
+            }
+
+            if USE_BASIC_AUTH:
+                headers = _get_refresh_headers()
+            else:
+                headers = {"Content-Type": "application/x-www-form-urlencoded"}
+                data["client_id"] = APP_KEY
+                if APP_SECRET:
+                    data["client_secret"] = APP_SECRET
+
+            resp = requests.post(TOKEN_URL, data=data, headers=headers, timeout=20)
+            print("[token] status:", resp.status_code, flush=True)
+            print("[token] body:", resp.text, flush=True)
+
+            if resp.ok:
+                try:
+                    payload = orjson.loads(resp.content)
+                    payload["_saved_at"] = int(time.time())
+                    with open(tokens_file, "wb") as f:
+                        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+                    os.chmod(tokens_file, 0o600)
+                    print(f"[token] Saved tokens to {tokens_file}", flush=True)
+                    saved.set()
+                except Exception as e:
+                    print("[token] couldn't parse/save JSON:", e, flush=True)
+                return "Tokens received  you can close this tab. Check your console.", 200
+            else:
+                return f"Token exchange failed ({resp.status_code}). See console.", 400
+        finally:
+            # End the wait whether or not the exchange succeeded
+            done.set()
+
+    # Plain WSGI server (no reloader, no debugger) that can be shut down from here
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(CERT_FILE, KEY_FILE)
+    server = make_server("127.0.0.1", 8443, app, ssl_context=ssl_context)
 
     # Start server and open browser
     print("Authorize URL (auto-opening):\n", authorize_url, flush=True)
-    threading.Thread(target=run_server, daemon=True).start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
     webbrowser.open_new(authorize_url)
     print("\nWaiting for callback...", flush=True)
 
-    # Keep the process alive
-    while True:
-        time.sleep(3600)
+    # Block until the code exchange finishes, then stop the server
+    finished = done.wait(timeout=600)
+    server.shutdown()
+
+    if not finished:
+        raise Exception("OAuth flow timed out waiting for callback")
+    if not saved.is_set():
+        raise Exception("OAuth flow failed: tokens were not saved (see console)")
 
 
 if __name__ == "__main__":